@@ -6,6 +6,9 @@ import sys
 import re
 import os
 
+# Matches the instance/solution number in a filename
+_NUM_RE = re.compile(r'\d+')
+
 def read_instance(filename):
     """
     Reads the LP Problem Instance for PSMC from a text file and returns objects
@@ -13,11 +16,10 @@ def read_instance(filename):
     [PARAMETERS]:
         filename (string): A .txt file of the instance
     [RETURNS]:
-        E (dict): A Dictionary of Elements in the instance
         S (dict): A Dictionary of Sets in the instance. Each Entry is a list
                 of the contents of the set itself.
-        r (dict): A Dictionary of Covering Requirements of Each Element in E
-        c (dict): A Dictionary of Cost associated with each set B in S
+        r (list): Covering Requirements of Each Element in E, indexed from 1
+        c (list): Cost associated with each set B in S, indexed from 1
         num_E (int): Number of elements in E
         num_S (int): Number of elements in S
         P (int): Integer specifying minimum number of covered elements required
@@ -30,82 +32,106 @@ def read_instance(filename):
         exit()
         
     # parsing enclosed in try block as an error would mean the file is not in
-    # the correct format    
+    # the correct format. Lines are read one at a time so the file is never
+    # held in memory as a whole.
     try:
-        instance = file.read().split('\n')
-        file.close()
-        
-        # Parse line 1
-        num_E, num_S, P = [int(i) for i in instance[0].split()]
-        E = [i for i in range(1,num_E+1)]
-        E = {key+1:value for key,value in enumerate(E)}
-        
-        # Parse line 2
-        r = [int(i) for i in instance[1].split()]
-        if len(r)!=num_E:
-            raise ValueError
-        
-        # Parse line 3
-        c = [int(i) for i in instance[2].split()]
-        if len(c)!=num_S:
-            raise ValueError
-        
-        # Parse rest
-        S = {}
-        for j,k in enumerate(range(3,len(instance))):
-            S[j+1] = [int(i) for i in instance[k].split()]
+        with file:
+            # Parse line 1
+            num_E, num_S, P = map(int, next(file).split())
+            
+            # Parse line 2
+            r = list(map(int, next(file).split()))
+            if len(r)!=num_E:
+                raise ValueError
+            
+            # Parse line 3
+            c = list(map(int, next(file).split()))
+            if len(c)!=num_S:
+                raise ValueError
+            
+            # Parse rest
+            S = {j+1: list(map(int, line.split())) for j,line in enumerate(file)}
             
         if len(S)!= num_S:
             raise ValueError
+        
+        # Every member of a set has to be one of the elements 1 to num_E
+        if not all(1<=e<=num_E for members in S.values() for e in members):
+            raise ValueError
             
-        c = dict(zip(S,c))
-        r = dict(zip(E,r))
+        # Pad with a leading sentinel so that both lists are indexed from 1
+        # like the elements and S
+        c.insert(0,None)
+        r.insert(0,None)
         
-        return E,S,r,c,num_E,num_S,P
+        return S,r,c,num_E,num_S,P
     
     except Exception as error:
         print("wrong format")
         exit()
 
-def create_Instance(E,S,r,c,num_E,num_S,P):
+def create_Instance(S,r,c,num_E,num_S,P):
     """
     Creates an instance of LP Minimization using the values returned by read_instance.
     [PARAMETERS]:
-        All outputs returned by read_instance
+        All outputs returned by read_instance. The elements of E are
+        numbered 1 to num_E.
     [RETURNS]:
         PSMC (pulp.LpProblem): A Model of PSMC with the currently read instance.
         x (dict): A Dictionary of Solution Set Inclusion.
         y (dict): A Dictionary of Satisifed Covering
+    [NOTE]:
+        Constraints are named "cover" for equation (1) and "cov_<i>" for
+        equation (2), so a model can be re-solved instead of being rebuilt.
+        A new P is set through the constant of "cover" and a new r[i] through
+        the coefficient of y[i] in "cov_<i>".
     """
     # Create a model which needs to be minimized
     PSMC = pulp.LpProblem("Partial Set Multi Cover",pulp.LpMinimize)
+    # Elements are numbered 1 to num_E
+    E = range(1,num_E+1)
     # Create a binary variable x which is 1 for a B in S' or 0 if not included
-    x = pulp.LpVariable.dict("x_%d",S,lowBound=0,upBound=1,cat='Integer')
+    x = {i: pulp.LpVariable("x_%d" % i, cat=pulp.LpBinary) for i in S}
     # Create a binary variable y which is 1 if an element E is covered else 0
-    y = pulp.LpVariable.dict("y_%d",E,lowBound=0,upBound=1,cat='Integer')
+    y = {i: pulp.LpVariable("y_%d" % i, cat=pulp.LpBinary) for i in E}
     # Create objective function
-    PSMC += sum( [c[i] * x[i] for i in S])
+    PSMC += pulp.LpAffineExpression([(x[i], c[i]) for i in S])
     # Create 1st constraint. See equation (1)
-    PSMC += sum([y[i] for i in E]) >= P
+    PSMC += pulp.LpAffineExpression([(y[i], 1) for i in E]) >= P, "cover"
+    # Index the sets containing each element so that the covering constraints
+    # are built in a single pass over the set contents. A set contributes at
+    # most once to an element however often the element is listed in it.
+    elem_to_sets = {i: [] for i in E}
+    for j, members in S.items():
+        for e in frozenset(members):
+            elem_to_sets[e].append(j)
     # Create constraints for covering each elements. See equation (2)
     for i in E:
-        PSMC += sum([x[j] for j in S if i in S[j]]) - y[i]*r[i] >=0
+        PSMC += pulp.LpAffineExpression(
+                [(x[j], 1) for j in elem_to_sets[i]] + [(y[i], -r[i])]) >= 0, "cov_%d" % i
     
     return PSMC,x,y
 
-def solve_instance(instance):
+def solve_instance(instance,timeLimit=600,gapRel=None):
     """
-    Solves The generated PSMC instance using the GLPK Solver.
+    Solves The generated PSMC instance using the CBC Solver bundled with PuLP.
     [PARAMETERS]:
-        Ouput returned by create_instance
+        instance (pulp.LpProblem): Ouput returned by create_instance
+        timeLimit (int): Time limit of the solver in seconds
+        gapRel (float): Relative optimality gap at which the search stops.
+                        None solves to optimality.
     [RETURNS]:
         nothing. Solving is in-place. The instance is directly modified.
     [NOTE]:
-        Use options parameter in function call to adjust GLPK cmd params
-        for help type glpsol --help in the command prompt/terminal
+        Use the keyword arguments of PULP_CBC_CMD to adjust CBC params.
+        The branch and bound search is run on all available cores.
+        Accepting a small gap such as 0.01 prunes most of the search tree on
+        large instances at the cost of a possibly suboptimal solution.
     """
-    # Solves the instance using GLPK with a process limit of 10 minutes
-    instance.solve(solver=pulp.solvers.GLPK_CMD(msg=1,options=['--tmlim','600']))
+    # Solves the instance using CBC, by default with a process limit of 10 minutes
+    instance.solve(solver=pulp.PULP_CBC_CMD(msg=1,timeLimit=timeLimit,
+                                            gapRel=gapRel,
+                                            threads=os.cpu_count()))
     #instance.solve()
     
 def main():
@@ -125,32 +151,27 @@ def main():
     
     # get number from instance i.e instance01.txt has number 01
     # this is necessary to create the appropriate output file    
-    number = re.findall('\d+',input_file)[0]
+    number = _NUM_RE.findall(input_file)[0]
     output_file = "solution"+str(number)+".txt"
     
     if os.path.exists(output_file):
         os.remove(output_file)
     
     # Read text file
-    E,S,r,c,num_E,num_S,P = read_instance(input_file)
+    S,r,c,num_E,num_S,P = read_instance(input_file)
     # Generate instance
-    PSMC,x,y = create_Instance(E,S,r,c,num_E,num_S,P)
+    PSMC,x,y = create_Instance(S,r,c,num_E,num_S,P)
     #Solve instance
     solve_instance(PSMC)
-    # Create string to write to file
-    cost = 0
-    k = 0
-    sets = []
-    for i in x:
-        if x[i].value() == 1:
-            cost += c[i]
-            k+=1
-            sets.append(i)
+    # Create string to write to file. Values are rounded as the solver may
+    # return a selected set as slightly less than 1.
+    sets = [i for i,var in x.items() if var.value() > 0.5]
+    cost = sum(c[i] for i in sets)
+    k = len(sets)
     # write solution to file
-    file = open(output_file,mode='x')
-    lines = str(k)+" "+str(cost)+''.join([" %s" % i for i in sets])
-    file.write(lines)
-    file.close()
+    lines = " ".join(map(str,[k,cost]+sets))
+    with open(output_file,mode='x') as file:
+        file.write(lines)
     
 
 if __name__ == "__main__":
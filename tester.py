@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from solver import read_instance
+from solver import read_instance, _NUM_RE
 import sys
-import re
 from collections import Counter
+from itertools import chain
 
 def read_solution(filename):
     """
@@ -43,7 +43,7 @@ def verify_costs(Sol_Set,Sol_Costs,C_dict):
     [PARAMETERS]:
         Sol_Set (list): List of Indices of sets included in solution (S')
         Sol_Costs (int): Total cost of soultion
-        C_dict (dict): A Dictionary of Cost associated with each set B in S
+        C_dict (list): Cost associated with each set B in S, indexed from 1
     [RETURNS]:
         A flag (bool) which is True if costs match otherwise False.
     """
@@ -65,12 +65,23 @@ def verify_costs(Sol_Set,Sol_Costs,C_dict):
     else:
         return False
 
+def count_covered(Re,cov):
+    """
+    Counts the elements whose covering requirement is met.
+    [PARAMETERS]:
+        Re (list): Covering Requirements of Each Element in E, indexed from 1
+        cov (Counter): Number of times each element E appears in the solution set
+    [RETURNS]:
+        The number of covered elements (int).
+    """
+    return sum(1 for i in cov if cov[i]>=Re[i])
+
 def verify_covering_requirement(Re,Sol_Set,S,P_thresh):
     """
     Verifies if the covering requirement constraint, see equation (2) of LP instance,
     is satisfied by the solution set S'.
     [PARAMETERS]:
-        Re (dict): A Dictionary of Covering Requirements of Each Element in E
+        Re (list): Covering Requirements of Each Element in E, indexed from 1
         Sol_Set (list): List of Indices of sets included in solution (S')
         S (dict): A Dictionary of Sets in the instance. Each Entry is a list
                 of the contents of the set itself.
@@ -80,16 +91,11 @@ def verify_covering_requirement(Re,Sol_Set,S,P_thresh):
     """
     
     # A counter is used to count the number of times an element E appears in the
-    # solution set
-    cov = Counter()
-    req=0
-    for i in Sol_Set:
-        cov.update(S[i])
+    # solution set. The contents of all sets are counted in a single pass.
+    cov = Counter(chain.from_iterable(S[i] for i in Sol_Set))
         
     # Check appearances against the covering requirements
-    for i in cov:
-        if cov[i]>=Re[i]:
-            req+=1
+    req = count_covered(Re,cov)
 #    try:
 #        assert req >= P_thresh, "Requirements Failed"
 #        return True
@@ -106,12 +112,12 @@ def verify_covering_requirement(Re,Sol_Set,S,P_thresh):
 def verify_minimal(Re,Sol_Set,S,P_thresh):
     """
     Verifies if the Solution Set S' is minimal or not by removing a set from S'
-    and checking whether the solution is feasible or not by calling the function
+    and checking whether the solution is feasible or not with the same check as
     verify_covering_requirement. A solution is deemed infeasible if removal of a
     set from S' still satisfies the covering requirement constraint.
     S' is minimal if removal of all sets one at a time fails the covering requirement.
     [PARAMETERS]:
-        Re (dict): A Dictionary of Covering Requirements of Each Element in E
+        Re (list): Covering Requirements of Each Element in E, indexed from 1
         Sol_Set (list): List of Indices of sets included in solution (S')
         S (dict): A Dictionary of Sets in the instance. Each Entry is a list
                 of the contents of the set itself.
@@ -119,16 +125,22 @@ def verify_minimal(Re,Sol_Set,S,P_thresh):
     [RETURNS]:
         A flag (bool) which is True if covering requirement is met otherwise False.
     """
+    # Count the coverage of S' once. Removing a set from S' can then only
+    # uncover elements of that set, so each removal checks just its contents.
+    cov = Counter(chain.from_iterable(S[i] for i in Sol_Set))
+    req = count_covered(Re,cov)
+    
     # Remove one set from S' at a time and check covering requirement
     # If covering requirement fails for all removals then S' is minimal
     for i in Sol_Set:
-        changed = Sol_Set.copy()
-        changed.remove(i)
-        flag = verify_covering_requirement(Re,changed,S,P_thresh)
-        if flag:
+        lost = 0
+        for e,n in Counter(S[i]).items():
+            # count_covered only counts elements still in the solution, so an
+            # element whose count drops to 0 is lost even if Re[e] is 0
+            if cov[e]>=Re[e] and not (cov[e]>n and cov[e]-n>=Re[e]):
+                lost += 1
+        if req-lost >= P_thresh:
             return False
-        else:
-            continue
     
     return True
         
@@ -167,8 +179,8 @@ def main():
     if not output_file.endswith(".txt"):
         raise AssertionError("Solution File is not a text file")
         
-    number_inst = re.findall('\d+',input_file)[0]
-    number_sol = re.findall('\d+',output_file)[0]
+    number_inst = _NUM_RE.findall(input_file)[0]
+    number_sol = _NUM_RE.findall(output_file)[0]
     
     try:
         assert number_inst==number_sol,'Files do not match'
@@ -176,7 +188,7 @@ def main():
         print("wrong format")
         exit()
         
-    E,S,r,c,num_E,num_S,P = read_instance(input_file)
+    S,r,c,num_E,num_S,P = read_instance(input_file)
     k,Costs,Sets = read_solution(output_file)
     
     # Now check costs, covering requirement and feasibility